@@ -4,13 +4,10 @@ Professional transit monitoring and analytics platform
 """
 
 import streamlit as st
-import requests
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import time
-from route_data import get_route_name
+from page_style import inject_css
+from transit_api import GO_API, TTC_API, clear_cache, fetch_many, metric_dict
 
 # Page config
 st.set_page_config(
@@ -21,44 +18,127 @@ st.set_page_config(
 )
 
 # Custom theme
-st.markdown("""
-    <style>
-    .main {padding: 0rem 1rem;}
-    .stMetric {
-        background: linear-gradient(135deg, #0066CC 0%, #0080FF 100%);
-        padding: 20px;
-        border-radius: 10px;
-        color: white;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-    .stMetric label {color: rgba(255,255,255,0.9) !important; font-weight: 600;}
-    .stMetric [data-testid="stMetricValue"] {color: white !important; font-size: 2rem !important;}
-    h1 {
-        background: linear-gradient(135deg, #0066CC 0%, #1E90FF 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 3rem;
-        font-weight: 800;
-    }
-    .metric-card {
-        background: white;
-        padding: 20px;
-        border-radius: 15px;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.1);
-        border-left: 5px solid #0066CC;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-GO_API = "https://ttc-alerts-api.vercel.app/api/go"
-TTC_API = "https://ttc-alerts-api.vercel.app/api"
-
-@st.cache_data(ttl=60)
-def fetch_data(url):
-    try:
-        return requests.get(url, timeout=10).json()
-    except:
-        return None
+inject_css("home.css")
+
+# ============================================================================
+# CHART BUILDERS - not cached: building a small figure is cheaper than unpickling a cached copy
+# ============================================================================
+def build_performance_gauge(performance):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=performance,
+        title={'text': "On-Time Performance", 'font': {'size': 24, 'color': '#00853E'}},
+        delta={'reference': 95, 'increasing': {'color': 'green'}},
+        number={'suffix': '%', 'font': {'size': 48}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 2},
+            'bar': {'color': "#00853E", 'thickness': 0.8},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 70], 'color': '#ffebee'},
+                {'range': [70, 85], 'color': '#fff9c4'},
+                {'range': [85, 95], 'color': '#e8f5e9'},
+                {'range': [95, 100], 'color': '#c8e6c9'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 95
+            }
+        }
+    ))
+    fig.update_layout(height=300, margin=dict(l=20, r=20, t=60, b=20))
+    return fig
+
+def build_fleet_pie(trains, buses):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(
+        labels=['Trains', 'Buses'],
+        values=[trains, buses],
+        hole=0.4,
+        marker=dict(colors=['#00853E', '#0066CC'], line=dict(color='white', width=2)),
+        textinfo='label+value+percent',
+        textfont=dict(size=14, color='white'),
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    fig.update_layout(
+        title={'text': 'Fleet Distribution', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20}},
+        height=300,
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+    )
+    return fig
+
+def build_status_bar(on_time, delayed):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[
+        go.Bar(
+            name='Vehicles',
+            x=['On Time', 'Delayed'],
+            y=[on_time, delayed],
+            marker=dict(
+                color=['#4CAF50', '#f44336'],
+                line=dict(color='white', width=2)
+            ),
+            text=[on_time, delayed],
+            textposition='outside',
+            textfont=dict(size=16, color='black', family='Arial Black'),
+            hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
+        )
+    ])
+    fig.update_layout(
+        title={'text': 'Service Status', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20}},
+        height=300,
+        yaxis_title='Number of Vehicles',
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    return fig
+
+def build_severity_gauge(critical_pct):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="number+gauge",
+        value=critical_pct,
+        title={'text': "Critical Alert Ratio", 'font': {'size': 20}},
+        number={'suffix': '%', 'font': {'size': 36}},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkred"},
+            'steps': [
+                {'range': [0, 25], 'color': "lightgreen"},
+                {'range': [25, 50], 'color': "lightyellow"},
+                {'range': [50, 100], 'color': "lightcoral"}
+            ]
+        }
+    ))
+    fig.update_layout(height=250)
+    return fig
+
+def build_services_pie(subway, bus, streetcar):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(
+        labels=['Subway', 'Bus', 'Streetcar'],
+        values=[subway, bus, streetcar],
+        marker=dict(colors=['#DA291C', '#0066CC', '#00853E']),
+        textinfo='label+value',
+        hole=0.3
+    )])
+    fig.update_layout(
+        title={'text': 'Alerts by Service', 'x': 0.5, 'xanchor': 'center'},
+        height=250
+    )
+    return fig
 
 # Sidebar
 with st.sidebar:
@@ -78,7 +158,7 @@ with st.sidebar:
     show_go = st.checkbox("Show GO Transit", value=True)
 
     if st.button("🔄 Refresh Now", use_container_width=True):
-        st.cache_data.clear()
+        clear_cache()
         st.rerun()
 
     st.markdown("---")
@@ -87,6 +167,21 @@ with st.sidebar:
     st.caption("• Metrolinx Open API")
     st.caption(f"🕐 {datetime.now().strftime('%H:%M:%S')}")
 
+# Fetch only the enabled sections' endpoints, in one concurrent round-trip
+endpoints = {}
+if show_go:
+    endpoints['go_stats'] = f"{GO_API}?type=stats"
+    endpoints['go_timeseries'] = f"{GO_API}?type=timeseries"
+if show_ttc:
+    endpoints['ttc_summary'] = f"{TTC_API}/summary"
+    endpoints['ttc_alerts'] = f"{TTC_API}/alerts"
+payloads = dict(zip(endpoints, fetch_many(tuple(endpoints.values()))))
+
+go_timeseries = payloads.get('go_timeseries')
+ttc_alerts = payloads.get('ttc_alerts')
+stats_dict = metric_dict(payloads.get('go_stats'))
+summary_dict = metric_dict(payloads.get('ttc_summary'))
+
 # Header
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -105,10 +200,7 @@ st.header("📊 Network Overview")
 col1, col2, col3, col4, col5 = st.columns(5)
 
 if show_go:
-    go_stats = fetch_data(f"{GO_API}?type=stats")
-    if go_stats:
-        stats_dict = {i['metric']: i['value'] for i in go_stats}
-
+    if stats_dict:
         with col1:
             st.metric(
                 "🚆 GO Performance",
@@ -126,10 +218,7 @@ if show_go:
                      delta=f"{round(stats_dict.get('On Time', 0) / stats_dict.get('Total Vehicles', 1) * 100)}%")
 
 if show_ttc:
-    ttc_summary = fetch_data(f"{TTC_API}/summary")
-    if ttc_summary:
-        summary_dict = {i['metric']: i['value'] for i in ttc_summary}
-
+    if summary_dict:
         with col4:
             st.metric("🚨 TTC Alerts", summary_dict.get('Total Alerts', 0),
                      delta=f"{summary_dict.get('Critical', 0)} critical",
@@ -148,88 +237,23 @@ st.markdown("---")
 if show_go:
     st.header("🚆 GO Transit Live Status")
 
-    go_stats = fetch_data(f"{GO_API}?type=stats")
-    if go_stats:
-        stats_dict = {i['metric']: i['value'] for i in go_stats}
-
+    if stats_dict:
         # Performance Dashboard
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
             # Performance Gauge
-            fig_gauge = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=stats_dict.get('Performance Rate', 0),
-                title={'text': "On-Time Performance", 'font': {'size': 24, 'color': '#00853E'}},
-                delta={'reference': 95, 'increasing': {'color': 'green'}},
-                number={'suffix': '%', 'font': {'size': 48}},
-                gauge={
-                    'axis': {'range': [None, 100], 'tickwidth': 2},
-                    'bar': {'color': "#00853E", 'thickness': 0.8},
-                    'bgcolor': "white",
-                    'borderwidth': 2,
-                    'bordercolor': "gray",
-                    'steps': [
-                        {'range': [0, 70], 'color': '#ffebee'},
-                        {'range': [70, 85], 'color': '#fff9c4'},
-                        {'range': [85, 95], 'color': '#e8f5e9'},
-                        {'range': [95, 100], 'color': '#c8e6c9'}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 95
-                    }
-                }
-            ))
-            fig_gauge.update_layout(height=300, margin=dict(l=20, r=20, t=60, b=20))
+            fig_gauge = build_performance_gauge(stats_dict.get('Performance Rate', 0))
             st.plotly_chart(fig_gauge, use_container_width=True)
 
         with col2:
             # Service Distribution
-            fig_fleet = go.Figure(data=[go.Pie(
-                labels=['Trains', 'Buses'],
-                values=[stats_dict.get('Trains Active', 0), stats_dict.get('Buses Active', 0)],
-                hole=0.4,
-                marker=dict(colors=['#00853E', '#0066CC'], line=dict(color='white', width=2)),
-                textinfo='label+value+percent',
-                textfont=dict(size=14, color='white'),
-                hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-            )])
-            fig_fleet.update_layout(
-                title={'text': 'Fleet Distribution', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20}},
-                height=300,
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
-            )
+            fig_fleet = build_fleet_pie(stats_dict.get('Trains Active', 0), stats_dict.get('Buses Active', 0))
             st.plotly_chart(fig_fleet, use_container_width=True)
 
         with col3:
             # On-Time vs Delayed
-            fig_status = go.Figure(data=[
-                go.Bar(
-                    name='Vehicles',
-                    x=['On Time', 'Delayed'],
-                    y=[stats_dict.get('On Time', 0), stats_dict.get('Delayed', 0)],
-                    marker=dict(
-                        color=['#4CAF50', '#f44336'],
-                        line=dict(color='white', width=2)
-                    ),
-                    text=[stats_dict.get('On Time', 0), stats_dict.get('Delayed', 0)],
-                    textposition='outside',
-                    textfont=dict(size=16, color='black', family='Arial Black'),
-                    hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
-                )
-            ])
-            fig_status.update_layout(
-                title={'text': 'Service Status', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20}},
-                height=300,
-                yaxis_title='Number of Vehicles',
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=40, r=40, t=60, b=40)
-            )
+            fig_status = build_status_bar(stats_dict.get('On Time', 0), stats_dict.get('Delayed', 0))
             st.plotly_chart(fig_status, use_container_width=True)
 
         with col4:
@@ -247,16 +271,19 @@ if show_go:
             st.markdown('</div>', unsafe_allow_html=True)
 
     # Time Series Trends
-    go_timeseries = fetch_data(f"{GO_API}?type=timeseries")
     if go_timeseries:
+        # Plotly, and chart_data's numpy/pandas, are only imported once there is a series to draw
+        import plotly.graph_objects as go
+        from chart_data import downsampled_series
+
         st.subheader("📈 24-Hour Activity Trends")
 
         fig_ts = go.Figure()
         colors = ['#00853E', '#0066CC', '#FF6B35']
 
         for idx, series in enumerate(go_timeseries):
-            timestamps = [datetime.fromtimestamp(p[1]/1000) for p in series['datapoints']]
-            values = [p[0] for p in series['datapoints']]
+            # Long series are LTTB-downsampled so the browser only draws what the chart can show
+            timestamps, values = downsampled_series(series['datapoints'])
 
             fig_ts.add_trace(go.Scatter(
                 x=timestamps,
@@ -289,54 +316,22 @@ if show_go:
 if show_ttc:
     st.header("🚇 TTC Service Status")
 
-    ttc_alerts = fetch_data(f"{TTC_API}/alerts")
-    ttc_summary = fetch_data(f"{TTC_API}/summary")
-
-    if ttc_summary:
-        summary_dict = {i['metric']: i['value'] for i in ttc_summary}
-
+    if summary_dict:
         col1, col2, col3 = st.columns(3)
 
         with col1:
             # Alert Severity Gauge
             critical_pct = (summary_dict.get('Critical', 0) / max(summary_dict.get('Total Alerts', 1), 1)) * 100
 
-            fig_severity = go.Figure(go.Indicator(
-                mode="number+gauge",
-                value=critical_pct,
-                title={'text': "Critical Alert Ratio", 'font': {'size': 20}},
-                number={'suffix': '%', 'font': {'size': 36}},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "darkred"},
-                    'steps': [
-                        {'range': [0, 25], 'color': "lightgreen"},
-                        {'range': [25, 50], 'color': "lightyellow"},
-                        {'range': [50, 100], 'color': "lightcoral"}
-                    ]
-                }
-            ))
-            fig_severity.update_layout(height=250)
+            fig_severity = build_severity_gauge(critical_pct)
             st.plotly_chart(fig_severity, use_container_width=True)
 
         with col2:
             # Service Type Distribution
-            service_data = [
-                ('Subway', summary_dict.get('Subway', 0)),
-                ('Bus', summary_dict.get('Bus', 0)),
-                ('Streetcar', summary_dict.get('Streetcar', 0))
-            ]
-
-            fig_services = go.Figure(data=[go.Pie(
-                labels=[s[0] for s in service_data],
-                values=[s[1] for s in service_data],
-                marker=dict(colors=['#DA291C', '#0066CC', '#00853E']),
-                textinfo='label+value',
-                hole=0.3
-            )])
-            fig_services.update_layout(
-                title={'text': 'Alerts by Service', 'x': 0.5, 'xanchor': 'center'},
-                height=250
+            fig_services = build_services_pie(
+                summary_dict.get('Subway', 0),
+                summary_dict.get('Bus', 0),
+                summary_dict.get('Streetcar', 0)
             )
             st.plotly_chart(fig_services, use_container_width=True)
 
@@ -347,15 +342,22 @@ if show_ttc:
             st.metric("High Severity", summary_dict.get('High Severity', 0))
 
     if ttc_alerts:
+        import numpy as np
+        import pandas as pd
+
         st.subheader("🚨 Active Service Disruptions")
         df_ttc = pd.DataFrame(ttc_alerts).head(15)
 
-        def highlight_severity(row):
-            colors = {'High': '#ffcdd2', 'Medium': '#fff9c4', 'Low': '#b3e5fc'}
-            color = colors.get(row['Severity'], '#ffffff')
-            return [f'background-color: {color}; padding: 10px; border-radius: 5px;'] * len(row)
+        # One vectorized pass picks every row's color; each column then reuses the same CSS array
+        severity = df_ttc['Severity'].to_numpy()
+        row_css = np.select(
+            [severity == 'High', severity == 'Medium', severity == 'Low'],
+            ['#ffcdd2', '#fff9c4', '#b3e5fc'],
+            default='#ffffff'
+        )
+        row_css = np.char.add(np.char.add('background-color: ', row_css), '; padding: 10px; border-radius: 5px;')
 
-        styled_df = df_ttc.style.apply(highlight_severity, axis=1)
+        styled_df = df_ttc.style.apply(lambda col: row_css, axis=0)
         st.dataframe(styled_df, use_container_width=True, height=400)
 
 # Footer
@@ -368,11 +370,14 @@ st.markdown("""
     </div>
 """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S EST")), unsafe_allow_html=True)
 
-# Auto-refresh
+# Auto-refresh: every full run restarts the countdown and the fragment's timed run reloads the page.
+# The cache is not cleared; each endpoint refetches only once its own TTL has expired.
+st.session_state.last_refresh = time.time()
+
+@st.fragment(run_every="60s")
+def auto_refresh_timer():
+    if time.time() - st.session_state.last_refresh >= 59:
+        st.rerun(scope="app")
+
 if auto_refresh:
-    if 'last_refresh' not in st.session_state:
-        st.session_state.last_refresh = time.time()
-    if time.time() - st.session_state.last_refresh > 60:
-        st.session_state.last_refresh = time.time()
-        st.cache_data.clear()
-        st.rerun()
+    auto_refresh_timer()
@@ -4,13 +4,15 @@ Professional transit monitoring and analytics platform
 """
 
 import streamlit as st
-import requests
-import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import time
+from chart_data import downsampled_series, map_view, with_location
+from page_style import inject_css
 from route_data import get_route_name
+from transit_api import GO_API, clear_cache, fetch_df, fetch_many, metric_dict, prewarm
 
 # Page config
 st.set_page_config(
@@ -21,229 +23,114 @@ st.set_page_config(
 )
 
 # Modern Premium Dashboard Theme
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@400;500;600;700;800&family=JetBrains+Mono:wght@400;500&display=swap');
-
-    * {
-        font-family: 'Plus Jakarta Sans', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-
-    /* Bright gradient background */
-    .stApp {
-        background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 50%, #f0f9ff 100%);
-    }
-
-    .main {
-        padding: 1.5rem 2rem !important;
-        max-width: 1600px;
-        margin: 0 auto;
-    }
-
-    /* Bright vibrant metric cards */
-    .stMetric {
-        background: linear-gradient(135deg, #ffffff 0%, #fefefe 100%) !important;
-        border: 2px solid #e0e7ff !important;
-        border-radius: 16px !important;
-        padding: 1.25rem 1rem !important;
-        box-shadow: 0 4px 20px rgba(59, 130, 246, 0.15) !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        min-height: 120px;
-    }
-    .stMetric:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 12px 32px rgba(59, 130, 246, 0.25) !important;
-        border-color: #3b82f6 !important;
-    }
-    .stMetric label {
-        color: #6366f1 !important;
-        font-weight: 700 !important;
-        font-size: 0.7rem !important;
-        text-transform: uppercase;
-        letter-spacing: 1.2px;
-        margin-bottom: 0.5rem !important;
-        display: block !important;
-    }
-    .stMetric [data-testid="stMetricValue"] {
-        color: #1e293b !important;
-        font-size: 2rem !important;
-        font-weight: 800 !important;
-        line-height: 1.2 !important;
-        margin: 0.25rem 0 !important;
-        display: block !important;
-    }
-    .stMetric [data-testid="stMetricDelta"] {
-        font-size: 0.8rem !important;
-        font-weight: 600 !important;
-        margin-top: 0.25rem !important;
-        color: #64748b !important;
-    }
-
-    /* Bright typography */
-    h1 {
-        color: #0f172a;
-        font-size: 3rem;
-        font-weight: 900;
-        margin-bottom: 0.5rem;
-        letter-spacing: -0.03em;
-        background: linear-gradient(135deg, #2563eb 0%, #7c3aed 50%, #db2777 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    h2 {
-        color: #1e293b;
-        font-size: 1.75rem;
-        font-weight: 800;
-        margin: 3rem 0 1.5rem 0;
-        position: relative;
-        padding-bottom: 1rem;
-    }
-    h2::after {
-        content: '';
-        position: absolute;
-        bottom: 0;
-        left: 0;
-        width: 80px;
-        height: 5px;
-        background: linear-gradient(90deg, #3b82f6 0%, #8b5cf6 100%);
-        border-radius: 3px;
-    }
-    h3 {
-        color: #334155;
-        font-size: 1.125rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-    }
-
-    /* Bright card containers */
-    .element-container:has(> .stPlotlyChart) {
-        background: #ffffff;
-        border: 2px solid #e0e7ff;
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 20px rgba(99, 102, 241, 0.1);
-        transition: all 0.3s ease;
-        margin-bottom: 1.5rem;
-    }
-    .element-container:has(> .stPlotlyChart):hover {
-        box-shadow: 0 8px 32px rgba(99, 102, 241, 0.15);
-        border-color: #c7d2fe;
-        transform: translateY(-2px);
-    }
-
-    /* Fix column gaps */
-    [data-testid="column"] {
-        padding: 0 0.5rem;
-    }
-
-    [data-testid="column"]:first-child {
-        padding-left: 0;
-    }
-
-    [data-testid="column"]:last-child {
-        padding-right: 0;
-    }
-
-    /* Accent colors */
-    .accent-blue { color: #3b82f6; }
-    .accent-purple { color: #8b5cf6; }
-    .accent-pink { color: #ec4899; }
-    .accent-green { color: #10b981; }
-    .accent-orange { color: #f59e0b; }
-
-    /* Section subtitle */
-    .section-subtitle {
-        color: #64748b;
-        font-size: 1rem;
-        font-weight: 600;
-        margin-top: 0.5rem;
-        margin-bottom: 2.5rem;
-        letter-spacing: 0.3px;
-    }
-
-    /* Bright divider */
-    hr {
-        margin: 3rem 0;
-        border: none;
-        height: 3px;
-        background: linear-gradient(90deg, transparent 0%, #3b82f6 50%, transparent 100%);
-        opacity: 0.4;
-    }
-
-    /* Bright sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #ffffff 0%, #f8fafc 100%);
-        border-right: 2px solid #e0e7ff;
-        box-shadow: 4px 0 24px rgba(99, 102, 241, 0.1);
-    }
-    [data-testid="stSidebar"] * {
-        color: #1e293b !important;
-    }
-    [data-testid="stSidebar"] .stButton button {
-        background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%);
-        border: none;
-        color: white !important;
-        font-weight: 700;
-        border-radius: 12px;
-        padding: 0.75rem 1.5rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3);
-    }
-    [data-testid="stSidebar"] .stButton button:hover {
-        transform: scale(1.05);
-        box-shadow: 0 8px 24px rgba(59, 130, 246, 0.5);
-    }
-
-    /* Code/monospace font for metrics */
-    .metric-value {
-        font-family: 'JetBrains Mono', monospace;
-    }
-
-    /* Animations */
-    @keyframes fadeInUp {
-        from {
-            opacity: 0;
-            transform: translateY(30px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-
-    .main > div {
-        animation: fadeInUp 0.6s ease-out;
-    }
-
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 10px;
-        height: 10px;
-    }
-    ::-webkit-scrollbar-track {
-        background: #1e293b;
-    }
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%);
-        border-radius: 10px;
-    }
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(135deg, #2563eb 0%, #7c3aed 100%);
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-GO_API = "https://ttc-alerts-api.vercel.app/api/go"
+inject_css("app.css")
 
-@st.cache_data(ttl=60)
-def fetch_data(url):
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"Error fetching data from {url}: {str(e)}")
-        return None
+# ============================================================================
+# CHART BUILDERS - not cached: building a small figure is cheaper than unpickling a cached copy
+# ============================================================================
+def build_performance_gauge(performance):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=performance,
+        title={'text': "On-Time Performance", 'font': {'size': 18, 'color': '#1e293b', 'family': 'Plus Jakarta Sans', 'weight': 700}},
+        delta={'reference': 95, 'increasing': {'color': '#10b981'}, 'decreasing': {'color': '#ef4444'}},
+        number={'suffix': '%', 'font': {'size': 40, 'color': '#0f172a', 'family': 'Plus Jakarta Sans', 'weight': 800}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': '#64748b', 'tickfont': {'color': '#475569', 'size': 11}},
+            'bar': {'color': "#3b82f6", 'thickness': 0.75},
+            'bgcolor': "#f1f5f9",
+            'borderwidth': 0,
+            'steps': [
+                {'range': [0, 70], 'color': '#fee2e2'},
+                {'range': [70, 85], 'color': '#fef3c7'},
+                {'range': [85, 95], 'color': '#dbeafe'},
+                {'range': [95, 100], 'color': '#d1fae5'}
+            ],
+            'threshold': {
+                'line': {'color': "#8b5cf6", 'width': 3},
+                'thickness': 0.75,
+                'value': 95
+            }
+        }
+    ))
+    fig.update_layout(
+        height=320,
+        margin=dict(l=10, r=10, t=80, b=10),
+        paper_bgcolor='#ffffff',
+        plot_bgcolor='#ffffff',
+        font=dict(color='#1e293b', family='Plus Jakarta Sans')
+    )
+    return fig
+
+
+def build_fleet_pie(trains, buses):
+    fig = go.Figure(data=[go.Pie(
+        labels=['Trains', 'Buses'],
+        values=[trains, buses],
+        hole=0.5,
+        marker=dict(
+            colors=['#3b82f6', '#8b5cf6'],
+            line=dict(color='rgba(255,255,255,0.1)', width=3)
+        ),
+        textinfo='label+value+percent',
+        textfont=dict(size=15, color='#1e293b', family='Plus Jakarta Sans', weight=600),
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    fig.update_layout(
+        title={'text': 'Fleet Distribution', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20, 'color': '#1e293b', 'family': 'Plus Jakarta Sans'}},
+        height=320,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.15,
+            xanchor="center",
+            x=0.5,
+            font=dict(color='#334155', size=12, family='Plus Jakarta Sans')
+        ),
+        paper_bgcolor='#ffffff',
+        plot_bgcolor='#ffffff',
+        font=dict(color='#1e293b', family='Plus Jakarta Sans')
+    )
+    return fig
+
+
+def build_status_bar(on_time, delayed):
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=['On Time', 'Delayed'],
+        y=[on_time, delayed],
+        marker=dict(
+            color=['#10b981', '#ec4899'],
+            line=dict(color='rgba(255,255,255,0.1)', width=2),
+            pattern=dict(shape=['', '/'], solidity=0.3)
+        ),
+        text=[on_time, delayed],
+        textposition='outside',
+        textfont=dict(size=18, color='#0f172a', family='Plus Jakarta Sans', weight=700)
+    ))
+
+    fig.update_layout(
+        title={'text': 'Service Status', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20, 'color': '#1e293b', 'family': 'Plus Jakarta Sans'}},
+        height=320,
+        yaxis=dict(
+            title='Vehicles',
+            color='#64748b',
+            gridcolor='#e2e8f0',
+            tickfont=dict(color='#334155', family='Plus Jakarta Sans')
+        ),
+        xaxis=dict(
+            color='#334155',
+            tickfont=dict(color='#334155', size=13, family='Plus Jakarta Sans', weight=600)
+        ),
+        showlegend=False,
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(color='#1e293b', family='Plus Jakarta Sans'),
+        margin=dict(l=50, r=30, t=80, b=50)
+    )
+    return fig
 
 # Sidebar
 with st.sidebar:
@@ -261,7 +148,7 @@ with st.sidebar:
     auto_refresh = st.checkbox("Auto-refresh (60s)", value=True)
 
     if st.button("🔄 Refresh Now", use_container_width=True):
-        st.cache_data.clear()
+        clear_cache()
         st.rerun()
 
     st.markdown("---")
@@ -283,6 +170,16 @@ st.markdown("""
 st.title("GO Transit Command Center")
 st.markdown(f"<p class='section-subtitle'>Real-time Performance Analytics • {datetime.now().strftime('%B %d, %Y at %H:%M EST')}</p>", unsafe_allow_html=True)
 
+# Every endpoint the page uses, fetched in one concurrent round-trip
+endpoints = (f"{GO_API}?type=stats", f"{GO_API}?type=timeseries", f"{GO_API}?type=vehicles")
+go_stats, go_timeseries, go_vehicles = fetch_many(endpoints)
+for url, payload in zip(endpoints, (go_stats, go_timeseries, go_vehicles)):
+    if payload is None:
+        st.error(f"Error fetching data from {url}")
+
+# The Analytics page's lines data, fetched in the background while this page renders
+prewarm((f"{GO_API}?type=lines&vehicleType=trains", f"{GO_API}?type=lines&vehicleType=buses"))
+
 # ============================================================================
 # NETWORK OVERVIEW - Hero Section
 # ============================================================================
@@ -292,9 +189,8 @@ st.markdown("<br>", unsafe_allow_html=True)
 
 col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="medium")
 
-go_stats = fetch_data(f"{GO_API}?type=stats")
 if go_stats and isinstance(go_stats, list) and len(go_stats) > 0:
-    stats_dict = {i['metric']: i['value'] for i in go_stats}
+    stats_dict = metric_dict(go_stats)
 else:
     st.warning("⚠️ Unable to load GO Transit statistics")
     stats_dict = {}
@@ -460,117 +356,25 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 st.header("GO Transit Live Status")
 st.markdown("<br>", unsafe_allow_html=True)
 
-go_stats = fetch_data(f"{GO_API}?type=stats")
 if go_stats:
-    stats_dict = {i['metric']: i['value'] for i in go_stats}
+    stats_dict = metric_dict(go_stats)
 
     # Performance Dashboard
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="medium")
 
     with col1:
         # Performance Gauge - Premium Theme
-        perf_value = stats_dict.get('Performance Rate', 0)
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=perf_value,
-            title={'text': "On-Time Performance", 'font': {'size': 18, 'color': '#1e293b', 'family': 'Plus Jakarta Sans', 'weight': 700}},
-            delta={'reference': 95, 'increasing': {'color': '#10b981'}, 'decreasing': {'color': '#ef4444'}},
-            number={'suffix': '%', 'font': {'size': 40, 'color': '#0f172a', 'family': 'Plus Jakarta Sans', 'weight': 800}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': '#64748b', 'tickfont': {'color': '#475569', 'size': 11}},
-                'bar': {'color': "#3b82f6", 'thickness': 0.75},
-                'bgcolor': "#f1f5f9",
-                'borderwidth': 0,
-                'steps': [
-                    {'range': [0, 70], 'color': '#fee2e2'},
-                    {'range': [70, 85], 'color': '#fef3c7'},
-                    {'range': [85, 95], 'color': '#dbeafe'},
-                    {'range': [95, 100], 'color': '#d1fae5'}
-                ],
-                'threshold': {
-                    'line': {'color': "#8b5cf6", 'width': 3},
-                    'thickness': 0.75,
-                    'value': 95
-                }
-            }
-        ))
-        fig_gauge.update_layout(
-            height=320,
-            margin=dict(l=10, r=10, t=80, b=10),
-            paper_bgcolor='#ffffff',
-            plot_bgcolor='#ffffff',
-            font=dict(color='#1e293b', family='Plus Jakarta Sans')
-        )
+        fig_gauge = build_performance_gauge(stats_dict.get('Performance Rate', 0))
         st.plotly_chart(fig_gauge, use_container_width=True)
 
     with col2:
         # Service Distribution - Premium Theme
-        fig_fleet = go.Figure(data=[go.Pie(
-            labels=['Trains', 'Buses'],
-            values=[stats_dict.get('Trains Active', 0), stats_dict.get('Buses Active', 0)],
-            hole=0.5,
-            marker=dict(
-                colors=['#3b82f6', '#8b5cf6'],
-                line=dict(color='rgba(255,255,255,0.1)', width=3)
-            ),
-            textinfo='label+value+percent',
-            textfont=dict(size=15, color='#1e293b', family='Plus Jakarta Sans', weight=600),
-            hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-        )])
-        fig_fleet.update_layout(
-            title={'text': 'Fleet Distribution', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20, 'color': '#1e293b', 'family': 'Plus Jakarta Sans'}},
-            height=320,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.15,
-                xanchor="center",
-                x=0.5,
-                font=dict(color='#334155', size=12, family='Plus Jakarta Sans')
-            ),
-            paper_bgcolor='#ffffff',
-            plot_bgcolor='#ffffff',
-            font=dict(color='#1e293b', family='Plus Jakarta Sans')
-        )
+        fig_fleet = build_fleet_pie(stats_dict.get('Trains Active', 0), stats_dict.get('Buses Active', 0))
         st.plotly_chart(fig_fleet, use_container_width=True)
 
     with col3:
         # On-Time vs Delayed - Premium Theme
-        fig_status = go.Figure()
-
-        fig_status.add_trace(go.Bar(
-            x=['On Time', 'Delayed'],
-            y=[stats_dict.get('On Time', 0), stats_dict.get('Delayed', 0)],
-            marker=dict(
-                color=['#10b981', '#ec4899'],
-                line=dict(color='rgba(255,255,255,0.1)', width=2),
-                pattern=dict(shape=['', '/'], solidity=0.3)
-            ),
-            text=[stats_dict.get('On Time', 0), stats_dict.get('Delayed', 0)],
-            textposition='outside',
-            textfont=dict(size=18, color='#0f172a', family='Plus Jakarta Sans', weight=700)
-        ))
-
-        fig_status.update_layout(
-            title={'text': 'Service Status', 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20, 'color': '#1e293b', 'family': 'Plus Jakarta Sans'}},
-            height=320,
-            yaxis=dict(
-                title='Vehicles',
-                color='#64748b',
-                gridcolor='#e2e8f0',
-                tickfont=dict(color='#334155', family='Plus Jakarta Sans')
-            ),
-            xaxis=dict(
-                color='#334155',
-                tickfont=dict(color='#334155', size=13, family='Plus Jakarta Sans', weight=600)
-            ),
-            showlegend=False,
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            font=dict(color='#1e293b', family='Plus Jakarta Sans'),
-            margin=dict(l=50, r=30, t=80, b=50)
-        )
+        fig_status = build_status_bar(stats_dict.get('On Time', 0), stats_dict.get('Delayed', 0))
         st.plotly_chart(fig_status, use_container_width=True)
 
     with col4:
@@ -607,7 +411,6 @@ if go_stats:
 
     # Time Series Trends - Premium Theme
     st.markdown("<br><br>", unsafe_allow_html=True)
-    go_timeseries = fetch_data(f"{GO_API}?type=timeseries")
     if go_timeseries:
         st.subheader("24-Hour Activity Trends")
         st.markdown("<br>", unsafe_allow_html=True)
@@ -617,8 +420,8 @@ if go_stats:
         fills = ['rgba(59, 130, 246, 0.1)', 'rgba(139, 92, 246, 0.1)', 'rgba(16, 185, 129, 0.1)']
 
         for idx, series in enumerate(go_timeseries):
-            timestamps = [datetime.fromtimestamp(p[1]/1000) for p in series['datapoints']]
-            values = [p[0] for p in series['datapoints']]
+            # Long series are LTTB-downsampled so the browser only draws what the chart can show
+            timestamps, values = downsampled_series(series['datapoints'])
 
             fig_ts.add_trace(go.Scatter(
                 x=timestamps,
@@ -675,12 +478,13 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 st.header("🗺️ Live Route Tracking")
 st.markdown("<p class='section-subtitle'>Select a route to view live vehicle positions on the map</p>", unsafe_allow_html=True)
 
-# Fetch vehicle data
+# Vehicle data (fetched with the other endpoints above)
 from route_data import GO_ROUTES, get_route_name
-go_vehicles = fetch_data(f"{GO_API}?type=vehicles")
 
-if go_vehicles:
-    df_vehicles = pd.DataFrame(go_vehicles)
+# Built once per TTL by fetch_df, so reruns from the route selectors reuse the same frame
+df_vehicles = fetch_df(endpoints[2]) if go_vehicles else None
+
+if df_vehicles is not None:
 
     # Get available routes with active vehicles
     if 'RouteCode' in df_vehicles.columns:
@@ -729,7 +533,7 @@ if go_vehicles:
             if selected_route:
                 # Filter vehicles for selected route
                 route_vehicles = df_vehicles[df_vehicles['RouteCode'] == selected_route]
-                route_vehicles_with_loc = route_vehicles[(route_vehicles['Latitude'] != 0) & (route_vehicles['Longitude'] != 0)]
+                route_vehicles_with_loc = with_location(route_vehicles)
 
                 if not route_vehicles_with_loc.empty:
                     # Display route info
@@ -749,32 +553,21 @@ if go_vehicles:
                         </div>
                     """, unsafe_allow_html=True)
 
-                    # Create map
-                    center_lat = route_vehicles_with_loc['Latitude'].mean()
-                    center_lon = route_vehicles_with_loc['Longitude'].mean()
-
-                    # Determine zoom
-                    lat_range = route_vehicles_with_loc['Latitude'].max() - route_vehicles_with_loc['Latitude'].min()
-                    lon_range = route_vehicles_with_loc['Longitude'].max() - route_vehicles_with_loc['Longitude'].min()
-                    max_range = max(lat_range, lon_range)
-
-                    if max_range < 0.1:
-                        zoom = 12
-                    elif max_range < 0.5:
-                        zoom = 10
-                    elif max_range < 1.0:
-                        zoom = 9
-                    else:
-                        zoom = 8
+                    # Create map - center and zoom fitted to the route's vehicles
+                    center, zoom = map_view(route_vehicles_with_loc)
 
                     import plotly.express as px
 
+                    # Only the plotted columns go to the browser, with coordinates as float32
+                    df_plot = route_vehicles_with_loc[['Latitude', 'Longitude', 'Status', 'Display', 'TripNumber', 'IsInMotion']].astype(
+                        {'Latitude': np.float32, 'Longitude': np.float32}
+                    )
+
                     fig_route_map = px.scatter_mapbox(
-                        route_vehicles_with_loc,
+                        df_plot,
                         lat="Latitude",
                         lon="Longitude",
                         color="Status",
-                        size=[15] * len(route_vehicles_with_loc),
                         hover_name="Display",
                         hover_data={
                             "TripNumber": True,
@@ -786,9 +579,11 @@ if go_vehicles:
                         color_discrete_map={"On Time": "#10b981", "Delayed": "#ef4444", "Early": "#3b82f6"},
                         zoom=zoom,
                         height=500,
-                        center={"lat": center_lat, "lon": center_lon}
+                        center=center
                     )
 
+                    # Constant marker size set on the traces rather than shipped as a per-row size column
+                    fig_route_map.update_traces(marker=dict(size=20))
                     fig_route_map.update_layout(
                         mapbox_style="open-street-map",
                         margin={"r": 0, "t": 0, "l": 0, "b": 0},
@@ -853,11 +648,14 @@ st.markdown("""
     </div>
 """.format(datetime.now().strftime("%H:%M")), unsafe_allow_html=True)
 
-# Auto-refresh
+# Auto-refresh: every full run restarts the countdown and the fragment's timed run reloads the page.
+# The cache is not cleared; each endpoint refetches only once its own TTL has expired.
+st.session_state.last_refresh = time.time()
+
+@st.fragment(run_every="60s")
+def auto_refresh_timer():
+    if time.time() - st.session_state.last_refresh >= 59:
+        st.rerun(scope="app")
+
 if auto_refresh:
-    if 'last_refresh' not in st.session_state:
-        st.session_state.last_refresh = time.time()
-    if time.time() - st.session_state.last_refresh > 60:
-        st.session_state.last_refresh = time.time()
-        st.cache_data.clear()
-        st.rerun()
+    auto_refresh_timer()
@@ -0,0 +1,124 @@
+"""Helpers that shape API payloads into arrays before they are handed to Plotly"""
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+
+def with_location(df):
+    """Rows with a reported position; the feed sends 0 for an unknown Latitude or Longitude"""
+    located = (df['Latitude'].to_numpy() != 0) & (df['Longitude'].to_numpy() != 0)
+    return df[located]
+
+
+def map_view(df):
+    """Map center and a zoom level that fits the points' spread, from one pass over the coordinate array"""
+    coords = df[['Latitude', 'Longitude']].to_numpy(dtype=np.float64)
+    center_lat, center_lon = coords.mean(axis=0)
+    max_range = np.ptp(coords, axis=0).max()
+
+    if max_range < 0.1:
+        zoom = 12
+    elif max_range < 0.5:
+        zoom = 10
+    elif max_range < 1.0:
+        zoom = 9
+    else:
+        zoom = 8
+    return {"lat": float(center_lat), "lon": float(center_lon)}, zoom
+
+
+def within_bounds(df, min_lat, max_lat, min_lon, max_lon):
+    """Rows whose position falls inside the lat/lon box, compared on the raw arrays"""
+    lat = df['Latitude'].to_numpy()
+    lon = df['Longitude'].to_numpy()
+    inside = (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+    return df[inside]
+
+
+def code_matches(codes, query):
+    """Case-insensitive `codes == query` that upper-cases each distinct code once instead of every row"""
+    if not isinstance(codes.dtype, pd.CategoricalDtype):
+        codes = codes.astype('category')
+    categories = codes.cat.categories
+    return codes.isin(categories[categories.astype(str).str.upper() == query.upper()])
+
+
+def top_k_indices(values, k):
+    """Positions of the k largest values, largest first, via a partial partition instead of a full sort"""
+    values = np.asarray(values)
+    k = min(k, len(values))
+    if k == 0:
+        return np.arange(0)
+    top = np.argpartition(-values, k - 1)[:k]
+    return top[np.argsort(-values[top], kind='stable')]
+
+
+def label_contains(labels, text):
+    """Case-insensitive substring match on a categorical column, tested once per category rather than per row"""
+    if not isinstance(labels.dtype, pd.CategoricalDtype):
+        labels = labels.astype('category')
+    categories = labels.cat.categories
+    return labels.isin(categories[categories.astype(str).str.contains(text, case=False, regex=False)])
+
+
+# Status keywords checked in this order; a status matching none of them falls in bucket len(STATUS_BUCKETS)
+STATUS_BUCKETS = ('On Time', 'Delay', 'Early')
+
+
+def status_buckets(status):
+    """int8 index into STATUS_BUCKETS for each row of a Status column, matched once per category rather than per row"""
+    status = pd.Series(status)
+    if not isinstance(status.dtype, pd.CategoricalDtype):
+        status = status.astype('category')
+    categories = status.cat.categories.astype(str)
+    per_category = np.select(
+        [categories.str.contains(word, case=False, regex=False) for word in STATUS_BUCKETS],
+        np.arange(len(STATUS_BUCKETS)),
+        default=len(STATUS_BUCKETS)
+    ).astype(np.int8)
+    # Missing statuses have code -1, which picks the trailing "no match" bucket
+    return np.append(per_category, np.int8(len(STATUS_BUCKETS)))[status.cat.codes.to_numpy()]
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the n_out points kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Keep the point forming the largest triangle with the last kept point and the next bucket's average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+
+    return keep
+
+
+def downsampled_series(datapoints, n_out=500, threshold=1000):
+    """Split [[value, timestamp_ms], ...] into (timestamps, values), LTTB-downsampled when longer than threshold"""
+    points = np.asarray(datapoints, dtype=np.float64).reshape(-1, 2)
+    values, ts_ms = points[:, 0], points[:, 1]
+
+    if len(points) > threshold:
+        keep = lttb_indices(ts_ms, values, n_out)
+        values, ts_ms = values[keep], ts_ms[keep]
+
+    # Server local time, as datetime.fromtimestamp gave; tzlocal() applies each point's own DST offset
+    timestamps = pd.to_datetime(ts_ms, unit='ms', utc=True).tz_convert(tzlocal()).tz_localize(None)
+    return timestamps, values
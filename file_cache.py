@@ -0,0 +1,56 @@
+"""On-disk JSON cache shared across Streamlit sessions, workers and restarts"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class FileCache:
+    """Stores JSON-serializable values as <md5(key)>.json files stamped with their write time"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.md5(key.encode()).hexdigest() + ".json")
+
+    def get(self, key, ttl):
+        """Return the value stored for key, or None if it is missing, unreadable or older than ttl seconds"""
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            if time.time() - entry["ts"] > ttl:
+                return None
+            return entry["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, unparseable, or valid JSON that is not a {"ts", "data"} entry
+            return None
+
+    def set(self, key, value):
+        """Write value for key; a failed write only means the next read misses"""
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"ts": time.time(), "data": value}, f)
+            # Atomic rename so concurrent readers never see a half-written entry
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError):
+            # Not written (disk error or a value json can't encode); don't leave the partial file behind
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        # *.tmp catches partial writes left by a process that died mid-set
+        for path in glob.glob(os.path.join(self.directory, "*.json")) + glob.glob(os.path.join(self.directory, "*.tmp")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,22 @@
+"""Page stylesheets, kept as plain .css files under static/"""
+
+import os
+
+import streamlit as st
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+@st.cache_resource
+def _read_css(name):
+    with open(os.path.join(STATIC_DIR, name)) as f:
+        return f.read()
+
+
+def inject_css(name):
+    """Apply static/<name> to the current page.
+
+    Streamlit drops any element a rerun does not emit again, so this must be called on every run;
+    the file itself is read once per process. st.html skips the markdown parser st.markdown would run.
+    """
+    st.html(f"<style>{_read_css(name)}</style>")
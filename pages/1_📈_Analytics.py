@@ -4,13 +4,14 @@ Comprehensive performance analytics and trends
 """
 
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
-from route_data import get_route_name
+from chart_data import lttb_indices, top_k_indices
+from route_data import route_names
+from transit_api import GO_API, fetch_many
 
 st.set_page_config(page_title="Analytics", page_icon="📈", layout="wide")
 
@@ -125,48 +126,318 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-GO_API = "https://ttc-alerts-api.vercel.app/api/go"
-
-@st.cache_data(ttl=60)
-def fetch_data(url):
-    try:
-        return requests.get(url, timeout=10).json()
-    except:
-        return None
-
 # Generate simulated historical data (in production, this would come from a database)
 @st.cache_data(ttl=3600)
 def generate_historical_data(days=30):
     """Generate simulated historical performance data"""
-    dates = [datetime.now() - timedelta(days=x) for x in range(days)]
-    dates.reverse()
+    # One row per day ending now, generated column-wise instead of a Python loop per day
+    dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
+
+    # Simulate realistic patterns
+    is_weekend = dates.weekday >= 5
+    is_peak = (7 <= dates.hour) & (dates.hour <= 9) | (16 <= dates.hour) & (dates.hour <= 19)
+
+    base_performance = np.where(is_weekend, 85, 80)
+    peak_penalty = np.where(is_peak, -5, 0)
+    random_variation = np.random.randint(-3, 8, size=days)
+
+    performance = np.clip(base_performance + peak_penalty + random_variation, 65, 100)
+
+    trains = np.random.randint(18, 28, size=days)
+    buses = np.random.randint(140, 180, size=days)
+    total_vehicles = trains + buses
+
+    return pd.DataFrame({
+        'date': dates,
+        # Week and month keys derived once here, shared by every trend aggregation below
+        'week': dates.to_period('W').to_timestamp(),
+        'month': dates.to_period('M').to_timestamp(),
+        # Heatmap axes, so the chart does not re-derive them (strftime is a per-row Python loop)
+        'day': dates.day.astype('int16'),
+        'month_name': dates.month_name(),
+        # Percentages and daily counts all fit in int16: a quarter of the int64 bytes to hash and serialize
+        'performance': performance.astype(np.int16),
+        'trains': trains.astype(np.int16),
+        'buses': buses.astype(np.int16),
+        'total_vehicles': total_vehicles.astype(np.int16),
+        'delayed': ((100 - performance) / 100 * total_vehicles).astype(np.int16),
+        'on_time': (performance / 100 * total_vehicles).astype(np.int16)
+    })
+
+# Summary charts keep their hover text but skip the mode bar and scroll zoom
+SUMMARY_CHART_CONFIG = {'displayModeBar': False, 'scrollZoom': False}
+
+# Box colours cycled across the months in the distribution chart
+MONTHLY_PALETTE = ('#00853E', '#0066CC', '#FF6B35')
+
+# ============================================================================
+# CHART BUILDERS - cached on df_history's contents so reruns from the sidebar toggles skip figure construction
+# ============================================================================
+# Dark-panel styling shared by the daily figures; applied as explicit layout values, which the
+# Streamlit chart theme leaves alone (a template would be replaced by it)
+DARK_LAYOUT = dict(
+    plot_bgcolor='#242629',
+    paper_bgcolor='#242629',
+    font=dict(color='#d8d9da'),
+    title=dict(font=dict(color='#d8d9da')),
+    xaxis=dict(title=dict(font=dict(color='#d8d9da')), color='#d8d9da', gridcolor='#2e3034'),
+    yaxis=dict(title=dict(font=dict(color='#d8d9da')), color='#d8d9da', gridcolor='#2e3034'),
+    legend=dict(font=dict(color='#d8d9da'))
+)
+
+@st.cache_data(ttl=3600)
+def build_daily_figs(df_history):
+    # 7-day average over the full history, before any thinning below
+    ma_7 = df_history['performance'].rolling(window=min(7, len(df_history))).mean()
+
+    # Histories past 1000 days are LTTB-downsampled to 500 points for the line traces
+    lines = df_history
+    if len(df_history) > 1000:
+        keep = lttb_indices(df_history['date'].to_numpy().astype(np.int64), df_history['performance'].to_numpy(), 500)
+        lines, ma_7 = df_history.iloc[keep], ma_7.iloc[keep]
+
+    # Long histories switch the line traces to WebGL; short ones keep SVG and spare a browser WebGL context
+    Scatter = go.Scattergl if len(lines) > 500 else go.Scatter
+
+    # Performance over time - Dark Theme
+    fig_daily = go.Figure()
+
+    fig_daily.add_trace(Scatter(
+        x=lines['date'],
+        y=lines['performance'],
+        mode='lines+markers',
+        name='Performance %',
+        line=dict(color='#73bf69', width=2),
+        marker=dict(size=6),
+        fill='tozeroy',
+        fillcolor='rgba(115, 191, 105, 0.1)',
+        hovertemplate='<b>Date:</b> %{x|%b %d}<br><b>Performance:</b> %{y:.1f}%<extra></extra>'
+    ))
+
+    # Add target line
+    fig_daily.add_hline(
+        y=95,
+        line_dash="dash",
+        line_color="#ff5705",
+        annotation_text="Target: 95%",
+        annotation_position="right",
+        annotation_font=dict(color='#d8d9da')
+    )
 
-    data = []
-    for date in dates:
-        # Simulate realistic patterns
-        is_weekend = date.weekday() >= 5
-        is_peak = 7 <= date.hour <= 9 or 16 <= date.hour <= 19
+    # Add moving average
+    fig_daily.add_trace(Scatter(
+        x=lines['date'],
+        y=ma_7,
+        mode='lines',
+        name='7-Day Moving Avg',
+        line=dict(color='#9fa3a8', width=2, dash='dot'),
+        hovertemplate='<b>7-Day Avg:</b> %{y:.1f}%<extra></extra>'
+    ))
+
+    fig_daily.update_layout(DARK_LAYOUT)
+    fig_daily.update_layout(
+        height=450,
+        hovermode='x unified',
+        xaxis=dict(title_text='Date', showgrid=True),
+        yaxis=dict(title_text='Performance %', range=[60, 105], showgrid=True),
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        )
+    )
 
-        base_performance = 85 if is_weekend else 80
-        peak_penalty = -5 if is_peak else 0
-        random_variation = np.random.randint(-3, 8)
+    # Vehicle activity
+    fig_vehicles = go.Figure()
+
+    fig_vehicles.add_trace(go.Bar(
+        x=df_history['date'],
+        y=df_history['trains'],
+        name='Trains',
+        marker=dict(color='#73bf69'),
+        hovertemplate='Trains: %{y}<extra></extra>'
+    ))
+
+    fig_vehicles.add_trace(go.Bar(
+        x=df_history['date'],
+        y=df_history['buses'],
+        name='Buses',
+        marker=dict(color='#6e9bd1'),
+        hovertemplate='Buses: %{y}<extra></extra>'
+    ))
+
+    fig_vehicles.update_layout(DARK_LAYOUT)
+    fig_vehicles.update_layout(
+        title_text='Daily Vehicle Count',
+        barmode='stack',
+        height=350,
+        hovermode='x unified',
+        xaxis_title_text='Date',
+        yaxis_title_text='Vehicles'
+    )
 
-        performance = min(100, max(65, base_performance + peak_penalty + random_variation))
+    fig_delays = go.Figure()
+
+    # Stack heights summed here rather than by a stackgroup in the browser; hover still reports the raw delayed count
+    on_time = lines['on_time'].to_numpy()
+    delayed = lines['delayed'].to_numpy()
+
+    fig_delays.add_trace(Scatter(
+        x=lines['date'],
+        y=on_time,
+        mode='lines',
+        name='On Time',
+        fill='tozeroy',
+        line=dict(color='#73bf69', width=2),
+        hovertemplate='On Time: %{y}<extra></extra>'
+    ))
+
+    fig_delays.add_trace(Scatter(
+        x=lines['date'],
+        y=on_time + delayed,
+        customdata=delayed,
+        mode='lines',
+        name='Delayed',
+        fill='tonexty',
+        line=dict(color='#ff5705', width=2),
+        hovertemplate='Delayed: %{customdata}<extra></extra>'
+    ))
+
+    fig_delays.update_layout(DARK_LAYOUT)
+    fig_delays.update_layout(
+        title_text='On-Time vs Delayed Vehicles',
+        height=350,
+        hovermode='x unified',
+        xaxis_title_text='Date',
+        yaxis_title_text='Vehicles'
+    )
 
-        trains = np.random.randint(18, 28)
-        buses = np.random.randint(140, 180)
+    return fig_daily, fig_vehicles, fig_delays
 
-        data.append({
-            'date': date,
-            'performance': performance,
-            'trains': trains,
-            'buses': buses,
-            'total_vehicles': trains + buses,
-            'delayed': int((100 - performance) / 100 * (trains + buses)),
-            'on_time': int(performance / 100 * (trains + buses))
-        })
 
-    return pd.DataFrame(data)
+@st.cache_data(ttl=3600)
+def build_weekly_figs(df_history):
+    # Group by week
+    df_weekly = df_history.groupby('week').agg({
+        'performance': 'mean',
+        'total_vehicles': 'mean',
+        'delayed': 'mean',
+        'on_time': 'mean'
+    }).reset_index()
+
+    fig_weekly_perf = go.Figure()
+
+    fig_weekly_perf.add_trace(go.Bar(
+        x=df_weekly['week'],
+        y=df_weekly['performance'],
+        marker=dict(
+            color=df_weekly['performance'],
+            colorscale='RdYlGn',
+            cmin=70,
+            cmax=100,
+            colorbar=dict(title="Performance %")
+        ),
+        text=[f"{p:.1f}%" for p in df_weekly['performance']],
+        textposition='outside',
+        hovertemplate='<b>Week of %{x|%b %d}</b><br>Avg Performance: %{y:.1f}%<extra></extra>'
+    ))
+
+    fig_weekly_perf.update_layout(
+        title='Weekly Average Performance',
+        height=400,
+        xaxis_title='Week',
+        yaxis_title='Performance %',
+        yaxis_range=[60, 105]
+    )
+
+    fig_weekly_vehicles = go.Figure()
+
+    fig_weekly_vehicles.add_trace(go.Scatter(
+        x=df_weekly['week'],
+        y=df_weekly['total_vehicles'],
+        mode='lines+markers',
+        name='Avg Vehicles',
+        line=dict(color='#0066CC', width=3),
+        marker=dict(size=10),
+        fill='tozeroy',
+        fillcolor='rgba(0, 102, 204, 0.2)'
+    ))
+
+    fig_weekly_vehicles.update_layout(
+        title='Weekly Average Vehicles',
+        height=400,
+        xaxis_title='Week',
+        yaxis_title='Vehicles'
+    )
+
+    return fig_weekly_perf, fig_weekly_vehicles
+
+
+@st.cache_data(ttl=3600)
+def build_monthly(df_history):
+    """Monthly statistics table plus the distribution box plot and day-by-month heatmap"""
+    # Group by month
+    # Named aggregations come out with flat column names, no MultiIndex to join back together
+    df_monthly = df_history.groupby('month').agg(
+        performance_mean=('performance', 'mean'),
+        performance_min=('performance', 'min'),
+        performance_max=('performance', 'max'),
+        performance_std=('performance', 'std'),
+        total_vehicles_sum=('total_vehicles', 'sum'),
+        delayed_sum=('delayed', 'sum')
+    ).reset_index()
+
+    # Arrow-backed columns, built once per cache entry, so st.dataframe hands them to its Arrow serializer as-is
+    summary_df = pd.DataFrame({
+        'Month': df_monthly['month'].dt.strftime('%B %Y'),
+        'Avg Performance': df_monthly['performance_mean'].map('{:.1f}%'.format),
+        'Best Day': df_monthly['performance_max'].map('{:.1f}%'.format),
+        'Worst Day': df_monthly['performance_min'].map('{:.1f}%'.format),
+        'Volatility (σ)': df_monthly['performance_std'].round(2),
+        'Total Vehicles': df_monthly['total_vehicles_sum'].astype(int),
+        'Total Delays': df_monthly['delayed_sum'].astype(int)
+    }).convert_dtypes(dtype_backend='pyarrow')
+
+    fig_monthly_box = go.Figure()
+
+    # One groupby split instead of a boolean mask over df_history per month
+    for i, (month, performance) in enumerate(df_history.groupby('month')['performance']):
+        fig_monthly_box.add_trace(go.Box(
+            y=performance.to_numpy(),
+            name=month.strftime('%b'),
+            marker_color=MONTHLY_PALETTE[i % len(MONTHLY_PALETTE)],
+            boxmean='sd'
+        ))
+
+    fig_monthly_box.update_layout(
+        title='Monthly Performance Distribution',
+        height=400,
+        yaxis_title='Performance %',
+        showlegend=False
+    )
+
+    fig_monthly_heatmap = go.Figure(data=go.Heatmap(
+        x=df_history['day'],
+        y=df_history['month_name'],
+        z=df_history['performance'],
+        colorscale='RdYlGn',
+        zmin=70,
+        zmax=100,
+        colorbar=dict(title="Performance %"),
+        hovertemplate='Day: %{x}<br>Month: %{y}<br>Performance: %{z:.1f}%<extra></extra>'
+    ))
+
+    fig_monthly_heatmap.update_layout(
+        title='Performance Heatmap',
+        height=400,
+        xaxis_title='Day of Month',
+        yaxis_title='Month'
+    )
+
+    return summary_df, fig_monthly_box, fig_monthly_heatmap
+
 
 # Header
 st.title("GO Transit Analytics")
@@ -192,14 +463,21 @@ with st.sidebar:
     show_routes = st.checkbox("Route Performance", value=True)
     show_insights = st.checkbox("Key Insights", value=True)
 
-# Fetch current data
-go_stats = fetch_data(f"{GO_API}?type=stats")
-go_lines_trains = fetch_data(f"{GO_API}?type=lines&vehicleType=trains")
-go_lines_buses = fetch_data(f"{GO_API}?type=lines&vehicleType=buses")
+# Current line data, both endpoints fetched in one concurrent round-trip
+go_lines_trains, go_lines_buses = fetch_many((f"{GO_API}?type=lines&vehicleType=trains",
+                                              f"{GO_API}?type=lines&vehicleType=buses"))
 
 # Generate historical data
 df_history = generate_historical_data(days)
 
+# Performance figures shared by the overview metrics and the insights cards, read off one array
+performance = df_history['performance'].to_numpy()
+avg_performance = performance.mean()
+current_performance = performance[-1]
+performance_trend = current_performance - performance[0]
+best_idx = performance.argmax()
+performance_std = performance.std(ddof=1)
+
 # ============================================================================
 # PERFORMANCE OVERVIEW
 # ============================================================================
@@ -207,10 +485,6 @@ if show_overview:
     st.header("📊 Performance Overview")
 
     # Calculate metrics
-    avg_performance = df_history['performance'].mean()
-    current_performance = df_history['performance'].iloc[-1]
-    performance_trend = current_performance - df_history['performance'].iloc[0]
-
     avg_vehicles = df_history['total_vehicles'].mean()
     avg_delays = df_history['delayed'].mean()
 
@@ -255,7 +529,7 @@ if show_overview:
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col5:
-        best_day = df_history.loc[df_history['performance'].idxmax()]
+        best_day = df_history.iloc[best_idx]
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             "Best Performance",
@@ -277,285 +551,41 @@ if show_trends:
     with tab1:
         st.subheader("Daily Performance Trends")
 
-        # Performance over time - Dark Theme
-        fig_daily = go.Figure()
-
-        fig_daily.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['performance'],
-            mode='lines+markers',
-            name='Performance %',
-            line=dict(color='#73bf69', width=2),
-            marker=dict(size=6),
-            fill='tozeroy',
-            fillcolor='rgba(115, 191, 105, 0.1)',
-            hovertemplate='<b>Date:</b> %{x|%b %d}<br><b>Performance:</b> %{y:.1f}%<extra></extra>'
-        ))
-
-        # Add target line
-        fig_daily.add_hline(
-            y=95,
-            line_dash="dash",
-            line_color="#ff5705",
-            annotation_text="Target: 95%",
-            annotation_position="right",
-            annotation_font=dict(color='#d8d9da')
-        )
-
-        # Add moving average
-        df_history['ma_7'] = df_history['performance'].rolling(window=min(7, len(df_history))).mean()
-        fig_daily.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['ma_7'],
-            mode='lines',
-            name='7-Day Moving Avg',
-            line=dict(color='#9fa3a8', width=2, dash='dot'),
-            hovertemplate='<b>7-Day Avg:</b> %{y:.1f}%<extra></extra>'
-        ))
-
-        fig_daily.update_layout(
-            height=450,
-            hovermode='x unified',
-            plot_bgcolor='#242629',
-            paper_bgcolor='#242629',
-            font=dict(color='#d8d9da'),
-            xaxis=dict(
-                title=dict(text='Date', font=dict(color='#d8d9da')),
-                showgrid=True,
-                gridcolor='#2e3034',
-                color='#d8d9da'
-            ),
-            yaxis=dict(
-                title=dict(text='Performance %', font=dict(color='#d8d9da')),
-                range=[60, 105],
-                showgrid=True,
-                gridcolor='#2e3034',
-                color='#d8d9da'
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="top",
-                y=-0.15,
-                xanchor="center",
-                x=0.5,
-                font=dict(color='#d8d9da')
-            )
-        )
-
+        fig_daily, fig_vehicles, fig_delays = build_daily_figs(df_history)
         st.plotly_chart(fig_daily, use_container_width=True)
 
         # Vehicle activity
         col1, col2 = st.columns(2)
-
         with col1:
-            fig_vehicles = go.Figure()
-
-            fig_vehicles.add_trace(go.Bar(
-                x=df_history['date'],
-                y=df_history['trains'],
-                name='Trains',
-                marker=dict(color='#73bf69'),
-                hovertemplate='Trains: %{y}<extra></extra>'
-            ))
-
-            fig_vehicles.add_trace(go.Bar(
-                x=df_history['date'],
-                y=df_history['buses'],
-                name='Buses',
-                marker=dict(color='#6e9bd1'),
-                hovertemplate='Buses: %{y}<extra></extra>'
-            ))
-
-            fig_vehicles.update_layout(
-                title={'text': 'Daily Vehicle Count', 'font': {'color': '#d8d9da'}},
-                barmode='stack',
-                height=350,
-                hovermode='x unified',
-                plot_bgcolor='#242629',
-                paper_bgcolor='#242629',
-                font=dict(color='#d8d9da'),
-                xaxis=dict(title=dict(text='Date', font=dict(color='#d8d9da')), color='#d8d9da', gridcolor='#2e3034'),
-                yaxis=dict(title=dict(text='Vehicles', font=dict(color='#d8d9da')), color='#d8d9da', gridcolor='#2e3034'),
-                legend=dict(font=dict(color='#d8d9da'))
-            )
-
             st.plotly_chart(fig_vehicles, use_container_width=True)
-
         with col2:
-            fig_delays = go.Figure()
-
-            fig_delays.add_trace(go.Scatter(
-                x=df_history['date'],
-                y=df_history['on_time'],
-                mode='lines',
-                name='On Time',
-                fill='tonexty',
-                line=dict(color='#73bf69', width=2),
-                stackgroup='one'
-            ))
-
-            fig_delays.add_trace(go.Scatter(
-                x=df_history['date'],
-                y=df_history['delayed'],
-                mode='lines',
-                name='Delayed',
-                fill='tonexty',
-                line=dict(color='#ff5705', width=2),
-                stackgroup='one'
-            ))
-
-            fig_delays.update_layout(
-                title={'text': 'On-Time vs Delayed Vehicles', 'font': {'color': '#d8d9da'}},
-                height=350,
-                hovermode='x unified',
-                plot_bgcolor='#242629',
-                paper_bgcolor='#242629',
-                font=dict(color='#d8d9da'),
-                xaxis=dict(title=dict(text='Date', font=dict(color='#d8d9da')), color='#d8d9da', gridcolor='#2e3034'),
-                yaxis=dict(title=dict(text='Vehicles', font=dict(color='#d8d9da')), color='#d8d9da', gridcolor='#2e3034'),
-                legend=dict(font=dict(color='#d8d9da'))
-            )
-
             st.plotly_chart(fig_delays, use_container_width=True)
 
     with tab2:
         st.subheader("Weekly Performance Analysis")
 
-        # Group by week
-        df_history['week'] = df_history['date'].dt.to_period('W').dt.to_timestamp()
-        df_weekly = df_history.groupby('week').agg({
-            'performance': 'mean',
-            'total_vehicles': 'mean',
-            'delayed': 'mean',
-            'on_time': 'mean'
-        }).reset_index()
-
+        fig_weekly_perf, fig_weekly_vehicles = build_weekly_figs(df_history)
         col1, col2 = st.columns(2)
-
         with col1:
-            fig_weekly_perf = go.Figure()
-
-            fig_weekly_perf.add_trace(go.Bar(
-                x=df_weekly['week'],
-                y=df_weekly['performance'],
-                marker=dict(
-                    color=df_weekly['performance'],
-                    colorscale='RdYlGn',
-                    cmin=70,
-                    cmax=100,
-                    colorbar=dict(title="Performance %")
-                ),
-                text=[f"{p:.1f}%" for p in df_weekly['performance']],
-                textposition='outside',
-                hovertemplate='<b>Week of %{x|%b %d}</b><br>Avg Performance: %{y:.1f}%<extra></extra>'
-            ))
-
-            fig_weekly_perf.update_layout(
-                title='Weekly Average Performance',
-                height=400,
-                xaxis_title='Week',
-                yaxis_title='Performance %',
-                yaxis_range=[60, 105]
-            )
-
-            st.plotly_chart(fig_weekly_perf, use_container_width=True)
-
+            st.plotly_chart(fig_weekly_perf, use_container_width=True, config=SUMMARY_CHART_CONFIG)
         with col2:
-            fig_weekly_vehicles = go.Figure()
-
-            fig_weekly_vehicles.add_trace(go.Scatter(
-                x=df_weekly['week'],
-                y=df_weekly['total_vehicles'],
-                mode='lines+markers',
-                name='Avg Vehicles',
-                line=dict(color='#0066CC', width=3),
-                marker=dict(size=10),
-                fill='tozeroy',
-                fillcolor='rgba(0, 102, 204, 0.2)'
-            ))
-
-            fig_weekly_vehicles.update_layout(
-                title='Weekly Average Vehicles',
-                height=400,
-                xaxis_title='Week',
-                yaxis_title='Vehicles'
-            )
-
             st.plotly_chart(fig_weekly_vehicles, use_container_width=True)
 
     with tab3:
         st.subheader("Monthly Performance Summary")
 
-        # Group by month
-        df_history['month'] = df_history['date'].dt.to_period('M').dt.to_timestamp()
-        df_monthly = df_history.groupby('month').agg({
-            'performance': ['mean', 'min', 'max', 'std'],
-            'total_vehicles': ['mean', 'sum'],
-            'delayed': ['mean', 'sum']
-        }).reset_index()
-
-        df_monthly.columns = ['_'.join(col).strip('_') for col in df_monthly.columns.values]
+        summary_df, fig_monthly_box, fig_monthly_heatmap = build_monthly(df_history)
 
         # Monthly summary table
         st.markdown("### Monthly Statistics")
-
-        summary_df = pd.DataFrame({
-            'Month': df_monthly['month'].dt.strftime('%B %Y'),
-            'Avg Performance': df_monthly['performance_mean'].round(1).astype(str) + '%',
-            'Best Day': df_monthly['performance_max'].round(1).astype(str) + '%',
-            'Worst Day': df_monthly['performance_min'].round(1).astype(str) + '%',
-            'Volatility (σ)': df_monthly['performance_std'].round(2),
-            'Total Vehicles': df_monthly['total_vehicles_sum'].astype(int),
-            'Total Delays': df_monthly['delayed_sum'].astype(int)
-        })
-
         st.dataframe(summary_df, use_container_width=True, height=200)
 
         # Monthly visualizations
         col1, col2 = st.columns(2)
-
         with col1:
-            fig_monthly_box = go.Figure()
-
-            for i, month in enumerate(df_monthly['month']):
-                month_data = df_history[df_history['month'] == month]
-
-                fig_monthly_box.add_trace(go.Box(
-                    y=month_data['performance'],
-                    name=month.strftime('%b'),
-                    marker_color=['#00853E', '#0066CC', '#FF6B35'][i % 3],
-                    boxmean='sd'
-                ))
-
-            fig_monthly_box.update_layout(
-                title='Monthly Performance Distribution',
-                height=400,
-                yaxis_title='Performance %',
-                showlegend=False
-            )
-
-            st.plotly_chart(fig_monthly_box, use_container_width=True)
-
+            st.plotly_chart(fig_monthly_box, use_container_width=True, config=SUMMARY_CHART_CONFIG)
         with col2:
-            fig_monthly_heatmap = go.Figure(data=go.Heatmap(
-                x=df_history['date'].dt.day,
-                y=df_history['date'].dt.strftime('%B'),
-                z=df_history['performance'],
-                colorscale='RdYlGn',
-                zmin=70,
-                zmax=100,
-                colorbar=dict(title="Performance %"),
-                hovertemplate='Day: %{x}<br>Month: %{y}<br>Performance: %{z:.1f}%<extra></extra>'
-            ))
-
-            fig_monthly_heatmap.update_layout(
-                title='Performance Heatmap',
-                height=400,
-                xaxis_title='Day of Month',
-                yaxis_title='Month'
-            )
-
-            st.plotly_chart(fig_monthly_heatmap, use_container_width=True)
+            st.plotly_chart(fig_monthly_heatmap, use_container_width=True, config=SUMMARY_CHART_CONFIG)
 
     st.markdown("---")
 
@@ -571,7 +601,7 @@ if show_routes:
         st.subheader("Train Lines")
         if go_lines_trains:
             df_trains = pd.DataFrame(go_lines_trains)
-            df_trains['LineName'] = df_trains['Code'].apply(get_route_name)
+            df_trains['LineName'] = route_names(df_trains['Code'])
             df_trains['OnTimeRate'] = (df_trains['OnTime'] / df_trains['Total'] * 100).round(1)
 
             fig_trains = go.Figure()
@@ -613,10 +643,10 @@ if show_routes:
         st.subheader("Top 10 Bus Routes")
         if go_lines_buses:
             df_buses = pd.DataFrame(go_lines_buses)
-            df_buses['RouteName'] = df_buses['Code'].apply(get_route_name)
+            df_buses['RouteName'] = route_names(df_buses['Code'])
             df_buses['OnTimeRate'] = (df_buses['OnTime'] / df_buses['Total'] * 100).round(1)
 
-            df_top_buses = df_buses.nlargest(10, 'Total')
+            df_top_buses = df_buses.iloc[top_k_indices(df_buses['Total'].to_numpy(), 10)]
 
             fig_buses = go.Figure()
 
@@ -650,7 +680,7 @@ if show_routes:
             st.plotly_chart(fig_buses, use_container_width=True)
 
             # Bus performance table
-            display_df = df_top_buses[['RouteName', 'Total', 'OnTime', 'Delayed', 'OnTimeRate']].sort_values('Total', ascending=False)
+            display_df = df_top_buses[['RouteName', 'Total', 'OnTime', 'Delayed', 'OnTimeRate']]
             st.dataframe(display_df, use_container_width=True, height=200)
 
     st.markdown("---")
@@ -678,10 +708,10 @@ if show_insights:
             avg_performance,
             "#73bf69" if avg_performance >= 95 else "#ff5705",
             "✅ Above" if avg_performance >= 95 else "⚠️ Below",
-            df_history['performance'].max(),
+            performance[best_idx],
             "#73bf69" if performance_trend >= 0 else "#ff5705",
             performance_trend,
-            df_history['performance'].std()
+            performance_std
         ), unsafe_allow_html=True)
 
     with insights_col2:
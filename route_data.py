@@ -1,5 +1,7 @@
 """GO Transit Route and Station Reference Data"""
 
+from functools import lru_cache
+
 # GO Transit Route Names (from GTFS)
 GO_ROUTES = {
     # Train Lines
@@ -52,40 +54,59 @@ GO_ROUTES = {
 }
 
 # Major GO Transit Stations
-GO_STATIONS = {
-    "UN": "Union Station",
-    "AL": "Aldershot GO",
-    "BR": "Bramalea GO",
-    "BU": "Burlington GO",
-    "CL": "Clarkson GO",
-    "ER": "Erindale GO",
-    "EX": "Exhibition GO",
-    "GU": "Guildwood GO",
-    "KE": "Kennedy GO",
-    "LI": "Liberty Village GO",
-    "LO": "Long Branch GO",
-    "MI": "Mimico GO",
-    "OA": "Oakville GO",
-    "PO": "Port Credit GO",
-    "RO": "Rouge Hill GO",
-    "SC": "Scarborough GO",
-    "WE": "West Harbour GO",
-    "AG": "Agincourt GO",
-    "MI": "Milliken GO",
-    "SC": "Scarborough GO",
-    "UN": "Unionville GO",
-    "CE": "Centennial GO",
-    "MA": "Malton GO",
-    "BR": "Bramalea GO",
-    "MT": "Mount Pleasant GO",
-    "DA": "Danforth GO",
-    "GE": "Gerrard GO"
-}
+# Milliken and Unionville are left out until their GTFS stop codes are confirmed; their old
+# entries reused MI (Mimico) and UN (Union) and overwrote those stations.
+_STATION_PAIRS = (
+    ("UN", "Union Station"),
+    ("AL", "Aldershot GO"),
+    ("BR", "Bramalea GO"),
+    ("BU", "Burlington GO"),
+    ("CL", "Clarkson GO"),
+    ("ER", "Erindale GO"),
+    ("EX", "Exhibition GO"),
+    ("GU", "Guildwood GO"),
+    ("KE", "Kennedy GO"),
+    ("LI", "Liberty Village GO"),
+    ("LO", "Long Branch GO"),
+    ("MI", "Mimico GO"),
+    ("OA", "Oakville GO"),
+    ("PO", "Port Credit GO"),
+    ("RO", "Rouge Hill GO"),
+    ("SC", "Scarborough GO"),
+    ("WE", "West Harbour GO"),
+    ("AG", "Agincourt GO"),
+    ("CE", "Centennial GO"),
+    ("MA", "Malton GO"),
+    ("MT", "Mount Pleasant GO"),
+    ("DA", "Danforth GO"),
+    ("GE", "Gerrard GO"),
+)
+GO_STATIONS = dict(_STATION_PAIRS)
 
+# A repeated code would silently replace the earlier station, as MI/UN/SC/BR once did.
+# An explicit check rather than assert, which python -O strips.
+if len(GO_STATIONS) != len(_STATION_PAIRS):
+    raise ValueError("duplicate station code in _STATION_PAIRS")
+
+# Not a Numba target: nopython mode has weak str support and its typed Dict is slower than a plain dict
+# for tables this small. Single lookups are lru_cached; whole columns go through route_names.
+@lru_cache(maxsize=512)
 def get_route_name(route_code):
     """Get full route name from code"""
-    return GO_ROUTES.get(str(route_code), f"Route {route_code}")
+    # The fallback is only formatted on a miss; as a .get() default it was built on every call
+    try:
+        return GO_ROUTES[str(route_code)]
+    except KeyError:
+        return f"Route {route_code}"
+
+def route_names(codes):
+    """get_route_name over a whole pandas Series of codes, as one dict map instead of a call per row"""
+    codes = codes.astype(str)
+    names = codes.map(GO_ROUTES).fillna("Route " + codes)
+    # astype(str) keeps missing codes as NaN; name them the way get_route_name(None) does
+    return names.fillna("Route None")
 
+@lru_cache(maxsize=512)
 def get_station_name(station_code):
     """Get full station name from code"""
     return GO_STATIONS.get(str(station_code), station_code)
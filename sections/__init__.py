@@ -0,0 +1,5 @@
+"""Page sections for the combined TTC + GO dashboard (app_old.py)
+
+Each module is imported only when its section is enabled, so a disabled
+section never pays for its plotting imports.
+"""
@@ -0,0 +1,147 @@
+"""GO Transit section: network stats, on-time trend, Union Station and line/route breakdowns"""
+
+from typing import NamedTuple
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from chart_data import downsampled_series, top_k_indices
+from route_data import route_names
+from transit_api import CACHE_TTL, fetch_df, metric_dict
+
+
+# Figures are rebuilt each run: a small figure builds faster than st.cache_data can unpickle a copy
+def build_gauge(rate):
+    fig = go.Figure(go.Indicator(mode="gauge+number", value=rate,
+                  gauge={'axis': {'range': [None, 100]}, 'bar': {'color': "blue"},
+                  'steps': [{'range': [0,70], 'color': "lightcoral"},
+                           {'range': [70,85], 'color': "lightyellow"},
+                           {'range': [85,100], 'color': "lightgreen"}]}))
+    fig.update_layout(height=250)
+    return fig
+
+
+def build_status_bar(on_time, delayed):
+    fig = go.Figure(go.Bar(x=['On Time', 'Delayed'], y=[on_time, delayed], marker_color=['green', 'red'],
+                           text=[on_time, delayed], textposition='outside'))
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def build_fleet_pie(trains, buses):
+    return go.Figure(go.Pie(labels=['Trains', 'Buses'], values=[trains, buses]))
+
+
+def build_top_routes_bar(top20):
+    fig = go.Figure()
+    # Plain arrays go straight to Plotly's typed-array encoding, skipping its Series coercion
+    names = top20['RouteName'].to_numpy()
+    fig.add_trace(go.Bar(y=names, x=top20['OnTime'].to_numpy(), name='On Time',
+                        orientation='h', marker=dict(color='green')))
+    fig.add_trace(go.Bar(y=names, x=top20['Delayed'].to_numpy(), name='Delayed',
+                        orientation='h', marker=dict(color='red')))
+    fig.update_layout(barmode='stack', height=600, yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+class BusRoutes(NamedTuple):
+    df: pd.DataFrame
+    top20: pd.DataFrame
+    total_buses: int
+    busiest_code: str
+    busiest_name: str
+    on_time_routes: int
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def bus_routes(url):
+    """Bus route frame and the aggregates shown beside it, computed once per TTL instead of every rerun"""
+    df = fetch_df(url)
+    if df is None:
+        return None
+    df['RouteName'] = route_names(df['Code'])
+
+    # Partial partition for the top 20 instead of sorting every route twice
+    totals = df['Total'].to_numpy()
+    busiest = df.iloc[totals.argmax()]
+
+    return BusRoutes(df=df, top20=df.iloc[top_k_indices(totals, 20)], total_buses=int(totals.sum()),
+                     busiest_code=busiest['Code'], busiest_name=busiest['RouteName'],
+                     on_time_routes=int((df['Delayed'].to_numpy() == 0).sum()))
+
+
+def render(payloads, endpoints):
+    st.header("🚆 GO Transit")
+    go_stats = payloads['go_stats']
+    if go_stats:
+        d = metric_dict(go_stats)
+        cols = st.columns(6)
+        cols[0].metric("Performance", f"{d.get('Performance Rate', 0)}%")
+        cols[1].metric("Vehicles", d.get('Total Vehicles', 0))
+        cols[2].metric("Trains", d.get('Trains Active', 0))
+        cols[3].metric("Buses", d.get('Buses Active', 0))
+        cols[4].metric("On Time", d.get('On Time', 0))
+        cols[5].metric("Delayed", d.get('Delayed', 0))
+
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.plotly_chart(build_gauge(d.get('Performance Rate', 0)), use_container_width=True)
+        with c2:
+            st.plotly_chart(build_status_bar(d.get('On Time', 0), d.get('Delayed', 0)), use_container_width=True)
+        with c3:
+            st.plotly_chart(build_fleet_pie(d.get('Trains Active', 0), d.get('Buses Active', 0)),
+                           use_container_width=True)
+
+    go_timeseries = payloads['go_timeseries']
+    if go_timeseries:
+        fig = go.Figure()
+        for s in go_timeseries:
+            timestamps, values = downsampled_series(s['datapoints'], n_out=500, threshold=500)
+            fig.add_trace(go.Scatter(x=timestamps, y=values, mode='lines', name=s['target']))
+        fig.update_layout(height=300)
+        st.plotly_chart(fig, use_container_width=True)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("🚉 Union Station")
+        df = fetch_df(endpoints['go_union'])
+        if df is not None:
+            st.dataframe(df, use_container_width=True, height=350)
+
+    with c2:
+        st.subheader("🚂 Train Lines")
+        df = fetch_df(endpoints['go_trains'])
+        if df is not None:
+            df['LineName'] = route_names(df['Code'])
+            names = df['LineName'].to_numpy()
+            fig = go.Figure([go.Bar(x=names, y=df['OnTime'].to_numpy(), name='OnTime'),
+                             go.Bar(x=names, y=df['Delayed'].to_numpy(), name='Delayed')])
+            fig.update_layout(barmode='group')
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(df[['LineName', 'Total', 'OnTime', 'Delayed']], use_container_width=True)
+
+    st.subheader("🚌 Bus Routes")
+    buses = bus_routes(endpoints['go_buses'])
+    if buses is not None:
+        df = buses.df
+
+        c1, c2 = st.columns([2, 1])
+        with c1:
+            st.plotly_chart(build_top_routes_bar(buses.top20), use_container_width=True)
+
+        with c2:
+            st.markdown("### 📊 Stats")
+            st.metric("Routes", len(df))
+            st.metric("Buses", buses.total_buses)
+            st.metric("Busiest", buses.busiest_code)
+            st.caption(buses.busiest_name)
+            st.metric("On-Time Routes", buses.on_time_routes)
+
+        with st.expander("📋 All Routes"):
+            search = st.text_input("Search:")
+            if search:
+                df = df[df['Code'].str.contains(search, case=False) | 
+                       df['RouteName'].str.contains(search, case=False)]
+            st.dataframe(df[['Code', 'RouteName', 'Total', 'OnTime', 'Delayed']],
+                        use_container_width=True, height=400)
@@ -0,0 +1,42 @@
+"""TTC section: network summary and the current service alerts"""
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from transit_api import metric_dict
+
+
+def render(ttc_summary, df_ttc):
+    st.header("🚇 TTC")
+    if ttc_summary:
+        cols = st.columns(6)
+        d = metric_dict(ttc_summary)
+        for i, (k, v) in enumerate(d.items()):
+            cols[i].metric(k, v)
+
+    if df_ttc is not None:
+        df_ttc = df_ttc.head(15)
+        severity = df_ttc['Severity'].to_numpy()
+        row_css = np.char.add('background-color: ', np.select(
+            [severity == 'High', severity == 'Medium', severity == 'Low'],
+            ['#f8d7da', '#fff3cd', '#d1ecf1'], default='#fff'))
+        st.dataframe(df_ttc.style.apply(lambda col: row_css, axis=0), use_container_width=True, height=350)
+
+        # Counted per column, so an alert missing one of Type/Severity still counts toward the other;
+        # categorical counts also list categories only seen outside the first 15 rows, so drop the zeros
+        type_counts = df_ttc['Type'].value_counts()
+        type_counts = type_counts[type_counts > 0]
+        severity_counts = df_ttc['Severity'].value_counts()
+        severity_counts = severity_counts[severity_counts > 0]
+
+        c1, c2 = st.columns(2)
+        with c1:
+            fig = go.Figure(go.Pie(labels=type_counts.index.astype(str), values=type_counts.values))
+            fig.update_layout(title='By Type')
+            st.plotly_chart(fig, use_container_width=True)
+        with c2:
+            fig = go.Figure(go.Bar(x=severity_counts.index.astype(str), y=severity_counts.values))
+            fig.update_layout(title='By Severity')
+            st.plotly_chart(fig, use_container_width=True)
+    st.markdown("---")
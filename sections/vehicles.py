@@ -0,0 +1,78 @@
+"""Vehicle search results and the live vehicle map"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from chart_data import code_matches, with_location
+from route_data import route_names
+
+VEHICLE_COLORS = {"Train": "#00853E", "Bus": "#0066CC"}
+# Any other vehicle type the feed reports still gets its own trace, in this colour
+OTHER_VEHICLE_COLOR = "#FF6B35"
+
+
+# Keyed on the frame's contents: an unchanged vehicle feed reuses the figure instead of rebuilding it
+@st.cache_data(ttl=60)
+def vehicle_map(df_map, hover_cols, zoom, height):
+    """One WebGL Scattermapbox trace per vehicle type, with coordinates sent as float32"""
+    coords = df_map[['Latitude', 'Longitude']].to_numpy(dtype=np.float32)
+    # Missing types are plotted as their own group, as px.scatter_mapbox(color="Type") did
+    types = df_map['Type'].astype(object).fillna("Unknown").to_numpy()
+    hover = df_map[list(hover_cols)].astype(str).to_numpy()
+    template = "<b>%{hovertext}</b>" + "".join(f"<br>{c}: %{{customdata[{i}]}}" for i, c in enumerate(hover_cols)) + "<extra></extra>"
+    fig = go.Figure()
+    for vtype in pd.unique(types):
+        mask = types == vtype
+        fig.add_trace(go.Scattermapbox(lat=coords[mask, 0], lon=coords[mask, 1], mode='markers', name=vtype,
+                                       marker=dict(size=8, color=VEHICLE_COLORS.get(vtype, OTHER_VEHICLE_COLOR)),
+                                       hovertext=df_map['Display'].to_numpy()[mask],
+                                       customdata=hover[mask], hovertemplate=template))
+    fig.update_layout(mapbox=dict(style="open-street-map", zoom=zoom,
+                                  center=dict(lat=float(coords[:, 0].mean()), lon=float(coords[:, 1].mean()))),
+                      height=height, margin={"r":0,"t":0,"l":0,"b":0})
+    return fig
+
+
+def render_search(df_vehicles, search_type, query):
+    df = df_vehicles
+    if search_type == "Trip #" and query:
+        df = df[df['TripNumber'].astype(str).str.contains(query, case=False)]
+    elif search_type == "Route" and query:
+        df = df[code_matches(df['Line'], query)]
+
+    if not df.empty:
+        st.success(f"🔍 Found {len(df)} vehicle(s)")
+        df['RouteName'] = route_names(df['Line'])
+        df_map = with_location(df)
+
+        if not df_map.empty:
+            fig = vehicle_map(df_map, ('Status', 'RouteName', 'TripNumber'), zoom=10, height=350)
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.dataframe(df[['Type', 'TripNumber', 'RouteName', 'Display', 'Status', 'IsInMotion']], use_container_width=True)
+        st.markdown("---")
+
+
+def render_live(df_vehicles):
+    st.subheader("🗺️ Live Vehicles")
+    df = df_vehicles
+    df['RouteName'] = route_names(df['Line'])
+    df_map = with_location(df)
+
+    if not df_map.empty:
+        types = df_map['Type'].to_numpy()
+        n_trains = int((types == 'Train').sum())
+        n_buses = int((types == 'Bus').sum())
+        n_moving = int(df_map['IsInMotion'].to_numpy().sum())
+
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            fig = vehicle_map(df_map, ('RouteName', 'Status'), zoom=8, height=450)
+            st.plotly_chart(fig, use_container_width=True)
+        with c2:
+            st.metric("Tracked", len(df_map))
+            st.metric("Trains", n_trains)
+            st.metric("Buses", n_buses)
+            st.metric("Moving", n_moving)
@@ -0,0 +1,133 @@
+"""Shared access to the GO Transit / TTC data API"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+import orjson
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+
+from file_cache import FileCache
+
+GO_API = "https://ttc-alerts-api.vercel.app/api/go"
+TTC_API = "https://ttc-alerts-api.vercel.app/api"
+
+# Seconds a payload stays fresh, both in Streamlit's in-memory cache and on disk
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 60))
+
+# Low-cardinality string columns stored as pandas categoricals: int8 codes instead of Python strings
+CATEGORY_COLUMNS = ("Type", "Status", "Line", "Severity")
+
+# Numeric columns shrunk with pd.to_numeric(downcast=...): coordinates to float32, counts to the smallest int
+NUMERIC_DOWNCAST = {"Latitude": "float", "Longitude": "float", "Total": "integer", "OnTime": "integer", "Delayed": "integer"}
+
+# Flag columns stored as plain bool; missing values become False, as the callers' `== True` checks treated them
+BOOL_COLUMNS = ("IsInMotion",)
+
+# One pooled session per process so the TCP/TLS connection to the API is reused
+# across endpoints, reruns and the fetch_many worker threads. Transient gateway errors
+# are retried briefly, and every compression urllib3 can decode here (br/zstd when
+# their packages are installed) is advertised so the vehicles payload comes compressed.
+_SESSION = requests.Session()
+_SESSION.headers["Accept-Encoding"] = ACCEPT_ENCODING
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+))
+
+# Second-level cache on disk: survives st.cache_data misses, new worker processes and cold starts
+_DISK_CACHE = FileCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+
+def _get_json(url):
+    """GET a JSON endpoint, returning None on any network or HTTP error"""
+    data = _DISK_CACHE.get(url, ttl=CACHE_TTL)
+    if data is not None:
+        return data
+    return _download(url)
+
+
+def _download(url):
+    """_get_json without the disk-cache read: always goes to the network and stores the fresh payload"""
+    try:
+        response = _SESSION.get(url, timeout=10)
+        response.raise_for_status()
+        # orjson parses the raw bytes directly, well ahead of requests' stdlib json on the vehicles payload
+        data = orjson.loads(response.content)
+    except Exception:
+        return None
+
+    _DISK_CACHE.set(url, data)
+    return data
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def fetch_data(url):
+    return _get_json(url)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def fetch_df(url, key=None):
+    """fetch_data, cached as a built DataFrame so reruns skip the records -> DataFrame step
+
+    key picks a list out of a dict payload (e.g. 'vehicles'); None is returned when there are no rows.
+    CATEGORY_COLUMNS present in the frame come back as categoricals, NUMERIC_DOWNCAST columns
+    in their smallest dtype and BOOL_COLUMNS as bool.
+    """
+    import pandas as pd
+
+    data = fetch_data(url)
+    if data and key is not None:
+        data = data.get(key)
+    if not data:
+        return None
+
+    df = pd.DataFrame.from_records(data)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col, kind in NUMERIC_DOWNCAST.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast=kind)
+    for col in BOOL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].eq(True)
+    return df
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def fetch_many(urls):
+    """Fetch several endpoints concurrently; results come back in request order"""
+    with ThreadPoolExecutor(max_workers=max(len(urls), 1)) as pool:
+        return list(pool.map(_get_json, urls))
+
+
+def metric_dict(rows):
+    """Turn a [{'metric': ..., 'value': ...}, ...] payload into a {metric: value} dict"""
+    rows = rows or []
+    return dict(zip(map(itemgetter('metric'), rows), map(itemgetter('value'), rows)))
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def prewarm(urls):
+    """Download urls into the disk cache on a background thread, at most once per CACHE_TTL
+
+    Meant for endpoints another page will need, so its first load reads from disk
+    instead of waiting on the network. The cached entry expires with the data, so the
+    first call after that starts a new download; nothing is fetched while no page calls it.
+    """
+    thread = threading.Thread(target=lambda: [_download(url) for url in urls], daemon=True)
+    thread.start()
+    return thread
+
+
+def clear_cache():
+    """Drop both cache levels so the next fetch goes to the network"""
+    st.cache_data.clear()
+    _DISK_CACHE.clear()